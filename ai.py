@@ -1,9 +1,221 @@
 import openai
-import base64
+import asyncio
+import functools
+import hashlib
 import json
-from typing import List, Dict, Optional
+import io
+import mmap
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Final, Iterator, List, Dict, Optional, Tuple
 import os
+import queue
 from dataclasses import dataclass
+import diskcache
+import httpx
+import numpy as np
+import pybase64
+import tiktoken
+from PIL import ExifTags, Image, ImageOps
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+# Images are downscaled to this longest edge and re-encoded as JPEG before upload
+MAX_IMAGE_EDGE = 1024
+JPEG_QUALITY = 85
+# Images whose 64-bit difference hashes differ in at most this many bits are
+# treated as near-duplicates (burst shots, reshoots) and only sent once
+DHASH_MAX_DISTANCE = 4
+# Number of encoded images kept in memory, keyed by content digest
+ENCODED_IMAGE_CACHE_SIZE = 64
+
+# Connection pool shared by all OpenAI requests. HTTP/2 multiplexes concurrent
+# requests over one connection and keep-alive avoids repeated TLS handshakes
+HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+HTTP_TIMEOUT = 60.0
+
+# Context window of the text models; the product analysis is truncated so
+# that the prompt plus the requested completion always fits
+CONTEXT_LIMIT = 128000
+# Allowance for message framing and the section labels around the analysis
+MESSAGE_OVERHEAD_TOKENS = 32
+
+# Completion budget for the combined listing JSON: the HTML description
+# (roughly 2000 tokens, more once escaped inside JSON) plus the short fields
+LISTING_FIELDS_MAX_TOKENS = 3500
+
+# Maximum number of OpenAI requests in flight per generator
+MAX_CONCURRENT_REQUESTS = 5
+
+# Transient OpenAI failures are retried with exponential backoff instead of
+# failing the whole listing
+retry_transient = retry(
+    retry=retry_if_exception_type((
+        openai.RateLimitError,
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.InternalServerError
+    )),
+    wait=wait_exponential(multiplier=1, min=1, max=30),
+    stop=stop_after_attempt(5),
+    reraise=True
+)
+
+def on_generator_loop(method):
+    """
+    Run a generator coroutine method on the generator's private event loop
+    
+    The shared HTTP client and request semaphore belong to that loop, so calls
+    awaited from any other loop are forwarded to it instead of touching them.
+    
+    Args:
+        method: Async method of eBayListingGenerator
+        
+    Returns:
+        Wrapped async method that can be awaited from any event loop
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        if asyncio.get_running_loop() is self._loop:
+            return await method(self, *args, **kwargs)
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(method(self, *args, **kwargs), self._loop)
+        )
+    return wrapper
+
+# Marks the end of a description stream handed between threads or loops
+_STREAM_END: Final = object()
+
+# Generated listings are cached on disk here unless another directory is given
+DEFAULT_CACHE_DIR = os.path.expanduser("~/.cache/ebay_listing")
+# Embedding model and cosine similarity threshold for the semantic cache
+EMBEDDING_MODEL = "text-embedding-3-small"
+SEMANTIC_CACHE_THRESHOLD = 0.95
+# Maximum number of products kept in the in-memory semantic cache
+SEMANTIC_CACHE_SIZE = 256
+
+# Stable preamble shared by every text generation step. It leads the system
+# message, followed by the product analysis, so all steps share one prefix
+# that OpenAI's automatic prompt caching can reuse
+LISTING_EXPERT_PREAMBLE: Final[str] = """You are an expert eBay listing assistant. You write accurate, \
+keyword-rich listings that help buyers find products and buy with confidence. Base every \
+answer only on the product analysis and user description below, and follow the task \
+instructions exactly."""
+
+# System message for batch requests, which carry the images rather than an analysis
+LISTING_FIELDS_SYSTEM: Final[str] = "You are an expert eBay listing assistant. You always respond with valid JSON."
+
+# Shared rules for the single-call listing generation (live and batch)
+LISTING_FIELDS_RULES: Final[str] = """
+"title" rules:
+- Maximum 80 characters
+- Include brand, model, condition, and key features
+- Use keywords that buyers search for
+- Avoid promotional language like "RARE" or "AMAZING"
+- Include size, color, or other variants if applicable
+
+"description" rules:
+Structure the description with:
+1. Product overview and key features
+2. Detailed specifications
+3. Condition details
+4. Shipping and return information
+5. Professional closing
+Use HTML formatting with bullet points for features, bold text for
+important information, and clear sections and headers. Make it
+professional and informative to increase buyer confidence.
+
+"category" rules:
+Use the format "Main Category > Subcategory > Specific Category", for example
+"Electronics > Computers & Tablets > Laptops & Netbooks" or
+"Fashion > Women's Clothing > Tops & Blouses". Choose the most specific and
+accurate category possible.
+
+"weight" rules:
+Estimate the postage weight in kilograms as a number (e.g. 0.5 for 500g,
+2.0 for 2kg), considering product size, materials, typical weight for similar
+items and 10-15% for packaging. Be conservative and slightly overestimate.
+
+Respond with a JSON object with exactly these keys:
+{"title": string, "description": string, "category": string, "weight": number}
+"""
+
+# Prompts. Task instructions follow the shared system message built by
+# _listing_messages; templates are filled with str.format
+ANALYSIS_SYSTEM_PROMPT: Final[str] = """You are an expert eBay listing assistant. Analyze the provided product images and extract detailed information about the product including:
+- Product type and brand
+- Condition assessment
+- Key features and specifications
+- Materials and dimensions if visible
+- Any defects or wear
+- Estimated value range
+
+Be thorough and accurate in your analysis."""
+ANALYSIS_USER_PROMPT: Final[str] = "Please analyze these product images."
+
+TITLE_INSTRUCTION: Final[str] = """Create an optimized eBay title for this product.
+
+Rules for eBay titles:
+- Maximum 80 characters
+- Include brand, model, condition, and key features
+- Use keywords that buyers search for
+- Avoid promotional language like "RARE" or "AMAZING"
+- Include size, color, or other variants if applicable
+
+Generate only the title, no additional text."""
+
+DESCRIPTION_INSTRUCTION: Final[str] = """Write a comprehensive eBay product description for this product.
+
+Structure the description with:
+1. Product overview and key features
+2. Detailed specifications
+3. Condition details
+4. Shipping and return information
+5. Professional closing
+
+Use HTML formatting for better presentation. Include:
+- Bullet points for features
+- Bold text for important information
+- Clear sections and headers
+
+Make it professional and informative to increase buyer confidence."""
+
+CATEGORY_INSTRUCTION: Final[str] = """Suggest the most appropriate eBay category for this product.
+
+Provide the category in this format: "Main Category > Subcategory > Specific Category"
+
+Common eBay categories include:
+- Electronics > Computers & Tablets > Laptops & Netbooks
+- Fashion > Women's Clothing > Tops & Blouses
+- Home & Garden > Kitchen, Dining & Bar > Small Kitchen Appliances
+- Collectibles > Trading Cards > Sports Trading Cards
+- Books > Fiction & Literature > Contemporary Fiction
+
+Choose the most specific and accurate category possible."""
+
+WEIGHT_INSTRUCTION: Final[str] = """Estimate the postage weight of this product in kilograms.
+
+Consider:
+- Product size and materials
+- Typical weight for similar items
+- Packaging requirements
+- Add 10-15% for packaging materials
+
+Be conservative and slightly overestimate for accurate shipping costs.
+
+Reply with only a JSON object of the form {"kg": number} (e.g. {"kg": 0.5} for 500g)."""
+
+LISTING_FIELDS_INSTRUCTION: Final[str] = "Create a complete eBay listing for this product.\n" + LISTING_FIELDS_RULES
+
+BATCH_LISTING_PROMPT: Final[str] = """Analyze these product images and create a complete eBay listing.
+
+User Description: {user_description}
+"""
+
+# First number in a free-text weight reply such as "1.2 kg"
+_WEIGHT_RE = re.compile(r"\d+\.?\d*")
 
 @dataclass
 class ProductListing:
@@ -19,88 +231,373 @@ class eBayListingGenerator:
     Core class for generating eBay listing details using OpenAI API
     """
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, cache_dir: str = None):
         """
         Initialize the eBay listing generator
         
         Args:
             api_key: OpenAI API key. If None, will try to get from environment variable
+            cache_dir: Directory for the listing cache. Defaults to DEFAULT_CACHE_DIR
         """
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         if not self.api_key:
             raise ValueError("OpenAI API key is required")
         
-        openai.api_key = self.api_key
+        # One async client is shared by every call so its connection pool is reused.
+        # Retries are handled by retry_transient, so the SDK's own are disabled
+        self._client = openai.AsyncOpenAI(
+            api_key=self.api_key,
+            max_retries=0,
+            http_client=httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        )
+        # Sync client for the Files and Batch APIs
+        self.client = openai.OpenAI(
+            api_key=self.api_key,
+            http_client=httpx.Client(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        )
+        
+        # The sync wrappers drive the async API on a private event loop, so the shared
+        # client is never left bound to a loop that has already been closed
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        
+        # Models per step: short constrained outputs use the fast model, the
+        # description and image analysis use the larger ones
+        self.fast_model = "gpt-4o-mini"
+        self.vision_model = "gpt-4o"
+        self.writer_model = "gpt-4o"
+        
+        # Encoded data URLs by image content digest, most recently used last
+        self._encoded_images: "OrderedDict[bytes, str]" = OrderedDict()
+        self._encoded_lock = threading.Lock()
+        
+        # Tokenizer and token counts of the fixed prompt parts, keyed by task
+        # instruction. The tokenizer may download its encoding on first load, so it
+        # is loaded on a background thread and never blocks the event loop; it is
+        # None while loading and False if loading failed
+        self._enc = None
+        self._sys_tokens: Dict[str, int] = {}
+        threading.Thread(target=self._load_tokenizer, daemon=True).start()
+        
+        # Gates concurrent OpenAI requests to stay within rate limits. Created on the
+        # generator's loop, as Python < 3.10 binds asyncio primitives at construction
+        self._sem = self._run(self._anew_semaphore())
+        
+        # Exact cache: hash of image bytes + user description -> listing fields
+        self._cache = diskcache.Cache(cache_dir or DEFAULT_CACHE_DIR)
+        # Semantic cache: one row per normalised analysis embedding, and the user
+        # description and fields generated for each row, oldest first
+        self._semantic_matrix: Optional[np.ndarray] = None
+        self._semantic_entries: List[Tuple[str, Dict]] = []
+    
+    def _run(self, coro):
+        """
+        Run a coroutine on the generator's event loop and wait for its result
+        
+        Args:
+            coro: Coroutine to execute
+            
+        Returns:
+            The coroutine's return value
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
     
     def encode_image(self, image_path: str) -> str:
         """
         Encode image to base64 string for OpenAI API
         
+        The image is downscaled to at most MAX_IMAGE_EDGE pixels on its longest
+        edge and re-encoded as JPEG, which keeps the request payload and the
+        number of vision tokens small. JPEGs that are already small enough and
+        upright are encoded straight from a memory map of the file.
+        
         Args:
             image_path: Path to the image file
             
         Returns:
-            Base64 encoded string of the image
+            Base64 encoded JPEG string of the image
+        """
+        with Image.open(image_path) as image:
+            if self._can_send_unchanged(image):
+                # No-resize fast path: encode from the page cache without copying the file
+                with open(image_path, "rb") as image_file, \
+                        mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return pybase64.b64encode(mapped).decode('ascii')
+            
+            return self._reencode_image(image)
+    
+    def encode_image_bytes(self, image_bytes: bytes) -> str:
+        """
+        Encode in-memory image data to base64 string for OpenAI API
+        
+        Same processing as encode_image, for images that were never written to disk.
+        
+        Args:
+            image_bytes: Raw image file contents
+            
+        Returns:
+            Base64 encoded JPEG string of the image
+        """
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            if self._can_send_unchanged(image):
+                return pybase64.b64encode(image_bytes).decode('ascii')
+            
+            return self._reencode_image(image)
+    
+    def _can_send_unchanged(self, image: Image.Image) -> bool:
+        """
+        Check whether an image can be sent as-is, without resizing or re-encoding
+        
+        Args:
+            image: Opened image
+            
+        Returns:
+            True for upright RGB or greyscale JPEGs within MAX_IMAGE_EDGE
+        """
+        return (image.format == "JPEG" and image.mode in ("RGB", "L")
+                and max(image.size) <= MAX_IMAGE_EDGE
+                and image.getexif().get(ExifTags.Base.Orientation, 1) == 1)
+    
+    def _reencode_image(self, image: Image.Image) -> str:
+        """
+        Downscale an image and re-encode it as a base64 JPEG
+        
+        Args:
+            image: Opened image
+            
+        Returns:
+            Base64 encoded JPEG string of the image
+        """
+        # Apply EXIF rotation, which is lost when the image is re-encoded
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((MAX_IMAGE_EDGE, MAX_IMAGE_EDGE), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.convert("RGB").save(buffer, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+        return pybase64.b64encode(buffer.getbuffer()).decode('ascii')
+    
+    def _is_image_url(self, image_ref: str) -> bool:
+        """
+        Check whether an image reference is a remote URL rather than a local file
+        
+        Args:
+            image_ref: Image path, URL or raw bytes
+            
+        Returns:
+            True for http(s) URLs
+        """
+        return isinstance(image_ref, str) and image_ref.startswith(("http://", "https://"))
+    
+    def _image_fingerprint(self, image_path: str) -> Tuple[bytes, Optional[int]]:
+        """
+        Compute the exact and perceptual hashes of an image
+        
+        Args:
+            image_path: Path, http(s) URL or raw bytes of the image
+            
+        Returns:
+            Tuple of (BLAKE2b digest of the file bytes, 64-bit difference hash).
+            URLs are only compared by address and have no difference hash.
         """
-        with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode('utf-8')
+        if self._is_image_url(image_path):
+            return hashlib.blake2b(image_path.encode("utf-8"), digest_size=16).digest(), None
+        
+        if isinstance(image_path, bytes):
+            digest = hashlib.blake2b(image_path, digest_size=16).digest()
+            source = io.BytesIO(image_path)
+        else:
+            with open(image_path, "rb") as image_file, \
+                    mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest = hashlib.blake2b(mapped, digest_size=16).digest()
+            source = image_path
+        
+        with Image.open(source) as image:
+            # Let the JPEG decoder downscale while decoding; only 9x8 pixels are needed
+            image.draft("L", (64, 64))
+            pixels = list(image.convert("L").resize((9, 8), Image.Resampling.LANCZOS).getdata())
+        
+        dhash = 0
+        for row in range(8):
+            for col in range(8):
+                dhash = (dhash << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+        return digest, dhash
+    
+    def _dedupe_images(self, image_paths: List[str]) -> List[Tuple[str, bytes]]:
+        """
+        Drop duplicate and near-duplicate images, keeping the first of each
+        
+        Args:
+            image_paths: List of paths, http(s) URLs or raw bytes of product images
+            
+        Returns:
+            (path, content digest) of the unique images, in their original order
+        """
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            fingerprints = list(executor.map(self._image_fingerprint, image_paths))
+        
+        # Exact duplicates: identical file contents
+        unique = OrderedDict()
+        for image_path, (digest, dhash) in zip(image_paths, fingerprints):
+            unique.setdefault(digest, (image_path, dhash))
+        
+        # Near-duplicates: difference hashes within DHASH_MAX_DISTANCE bits
+        kept, kept_hashes = [], []
+        for digest, (image_path, dhash) in unique.items():
+            if dhash is None:
+                kept.append((image_path, digest))
+                continue
+            if any(bin(dhash ^ other).count("1") <= DHASH_MAX_DISTANCE for other in kept_hashes):
+                continue
+            kept.append((image_path, digest))
+            kept_hashes.append(dhash)
+        
+        return kept
+    
+    @staticmethod
+    async def _anew_semaphore() -> asyncio.Semaphore:
+        """
+        Async implementation of creating the request semaphore on the running loop
+        """
+        return asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    
+    @on_generator_loop
+    @retry_transient
+    async def _acreate(self, **kwargs):
+        """
+        Create a chat completion through the shared client
+        
+        Requests are limited to MAX_CONCURRENT_REQUESTS at a time and retried
+        with exponential backoff on rate limit, timeout, connection and server errors.
+        
+        Args:
+            **kwargs: Arguments for chat.completions.create
+            
+        Returns:
+            Chat completion response
+        """
+        async with self._sem:
+            return await self._client.chat.completions.create(**kwargs)
+    
+    def _image_content(self, image_path: str, digest: bytes) -> Dict:
+        """
+        Build a chat message content part for an image
+        
+        http(s) URLs are passed through for OpenAI to fetch, which avoids the
+        base64 step and keeps the request body small. Local files are encoded
+        into a data URL once per content digest and reused by later requests
+        about the same image.
+        
+        Args:
+            image_path: Path, http(s) URL or raw bytes of the image
+            digest: Content digest from _image_fingerprint
+            
+        Returns:
+            Content part dictionary for the OpenAI API
+        """
+        if self._is_image_url(image_path):
+            url = image_path
+        else:
+            with self._encoded_lock:
+                url = self._encoded_images.get(digest)
+                if url is not None:
+                    self._encoded_images.move_to_end(digest)
+            
+            if url is None:
+                if isinstance(image_path, bytes):
+                    base64_image = self.encode_image_bytes(image_path)
+                else:
+                    base64_image = self.encode_image(image_path)
+                url = f"data:image/jpeg;base64,{base64_image}"
+                with self._encoded_lock:
+                    self._encoded_images[digest] = url
+                    while len(self._encoded_images) > ENCODED_IMAGE_CACHE_SIZE:
+                        self._encoded_images.popitem(last=False)
+        
+        return {
+            "type": "image_url",
+            "image_url": {
+                "url": url
+            }
+        }
     
     def analyze_product_images(self, image_paths: List[str], user_description: str = "") -> Dict:
         """
         Analyze product images to extract product information
         
+        The analysis depends on the images alone and is cached on disk by their
+        content, so editing the description never repeats the vision call.
+        
         Args:
-            image_paths: List of paths to product images
-            user_description: Optional user-provided description
+            image_paths: List of paths, http(s) URLs or raw bytes of product images
+            user_description: Unused; kept for backwards compatibility. The
+                description is applied when the listing fields are generated
             
         Returns:
             Dictionary containing product analysis
         """
-        # Prepare images for OpenAI API
-        image_contents = []
-        for image_path in image_paths[:6]:  # Limit to 6 images
-            base64_image = self.encode_image(image_path)
-            image_contents.append({
-                "type": "image_url",
-                "image_url": {
-                    "url": f"data:image/jpeg;base64,{base64_image}"
-                }
-            })
+        return self._run(self._aanalyze(image_paths, user_description))
+    
+    @on_generator_loop
+    async def _aanalyze(self, image_paths: List[str], user_description: str = "") -> Dict:
+        """
+        Async implementation of analyze_product_images
+        """
+        # Prepare images for OpenAI API, skipping duplicates
+        unique_images = (await asyncio.to_thread(self._dedupe_images, image_paths))[:6]  # Limit to 6 images
+        return await self._aanalyze_unique(unique_images)
+    
+    @on_generator_loop
+    async def _aanalyze_unique(self, unique_images: List[Tuple[str, bytes]]) -> Dict:
+        """
+        Analyze already deduplicated product images
+        
+        Args:
+            unique_images: (path, content digest) of at most 6 unique images
+            
+        Returns:
+            Dictionary containing the analysis results
+        """
+        # The same set of images always yields the same analysis
+        cache_key = "analysis:" + hashlib.sha256(b"".join(sorted(digest for _, digest in unique_images))).hexdigest()
+        analysis = self._cache.get(cache_key)
+        if analysis is not None:
+            return {
+                "analysis": analysis,
+                "success": True
+            }
+        
+        image_contents = list(await asyncio.gather(
+            *(asyncio.to_thread(self._image_content, image_path, digest) for image_path, digest in unique_images)
+        ))
         
         # Create the prompt for product analysis
         messages = [
             {
                 "role": "system",
-                "content": """You are an expert eBay listing assistant. Analyze the provided product images and extract detailed information about the product including:
-                - Product type and brand
-                - Condition assessment
-                - Key features and specifications
-                - Materials and dimensions if visible
-                - Any defects or wear
-                - Estimated value range
-                
-                Be thorough and accurate in your analysis."""
+                "content": ANALYSIS_SYSTEM_PROMPT
             },
             {
                 "role": "user",
                 "content": [
                     {
                         "type": "text",
-                        "text": f"Please analyze these product images. Additional user description: {user_description}"
+                        "text": ANALYSIS_USER_PROMPT
                     }
                 ] + image_contents
             }
         ]
         
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4-vision-preview",
+            response = await self._acreate(
+                model=self.vision_model,
                 messages=messages,
                 max_tokens=1000
             )
             
+            analysis = response.choices[0].message.content
+            self._cache[cache_key] = analysis
+            
             return {
-                "analysis": response.choices[0].message.content,
+                "analysis": analysis,
                 "success": True
             }
         except Exception as e:
@@ -109,40 +606,103 @@ class eBayListingGenerator:
                 "success": False
             }
     
-    def generate_ebay_title(self, product_analysis: str, user_description: str = "") -> str:
+    def _load_tokenizer(self):
         """
-        Generate an optimized eBay title
+        Load the tokenizer for the writer model, recording False on failure
+        """
+        try:
+            self._enc = tiktoken.encoding_for_model(self.writer_model)
+        except Exception:
+            # Usually a failed download of the encoding; truncation is skipped instead
+            self._enc = False
+    
+    def _fit_prompt(self, product_analysis: str, user_description: str, instruction: str, max_tokens: int) -> Tuple[str, str]:
+        """
+        Truncate the prompt inputs so the request fits the context window
+        
+        The product analysis is cut first; the user description only when it
+        alone exceeds the window. While the tokenizer is still loading, or if it
+        could not be loaded, the inputs are sent unchanged, as the analysis is
+        normally far below the limit.
         
         Args:
             product_analysis: Analysis of the product from images
             user_description: Additional user description
+            instruction: Task-specific instruction
+            max_tokens: Completion tokens requested
             
         Returns:
-            Generated eBay title (max 80 characters)
+            Tuple of the product analysis and user description, cut to the
+            available token budget if needed
         """
-        prompt = f"""
-        Based on the product analysis and user description, create an optimized eBay title.
+        if not self._enc:
+            return product_analysis, user_description
+        
+        fixed_tokens = self._sys_tokens.get(instruction)
+        if fixed_tokens is None:
+            fixed_tokens = len(self._enc.encode(LISTING_EXPERT_PREAMBLE + instruction)) + MESSAGE_OVERHEAD_TOKENS
+            self._sys_tokens[instruction] = fixed_tokens
+        
+        budget = max(CONTEXT_LIMIT - fixed_tokens - max_tokens, 0)
+        description_tokens = self._enc.encode(user_description)
+        if len(description_tokens) > budget:
+            user_description = self._enc.decode(description_tokens[:budget])
+            return "", user_description
         
-        Product Analysis: {product_analysis}
-        User Description: {user_description}
+        budget -= len(description_tokens)
+        tokens = self._enc.encode(product_analysis)
+        if len(tokens) <= budget:
+            return product_analysis, user_description
+        return self._enc.decode(tokens[:budget]), user_description
+    
+    def _listing_messages(self, product_analysis: str, user_description: str, instruction: str, max_tokens: int) -> List[Dict]:
+        """
+        Build chat messages for a text generation step
         
-        Rules for eBay titles:
-        - Maximum 80 characters
-        - Include brand, model, condition, and key features
-        - Use keywords that buyers search for
-        - Avoid promotional language like "RARE" or "AMAZING"
-        - Include size, color, or other variants if applicable
+        The product analysis goes first, inside a system message that is the
+        same for every step, so repeated calls about one product hit OpenAI's
+        prompt cache. Only the short task instruction differs between steps.
         
-        Generate only the title, no additional text.
+        Args:
+            product_analysis: Analysis of the product from images
+            user_description: Additional user description
+            instruction: Task-specific instruction
+            max_tokens: Completion tokens requested, reserved from the context window
+            
+        Returns:
+            List of chat messages
+        """
+        product_analysis, user_description = self._fit_prompt(product_analysis, user_description, instruction, max_tokens)
+        return [
+            {
+                "role": "system",
+                "content": f"{LISTING_EXPERT_PREAMBLE}\n\nPRODUCT ANALYSIS:\n{product_analysis}\n\nUSER:\n{user_description}"
+            },
+            {"role": "user", "content": instruction}
+        ]
+    
+    def generate_ebay_title(self, product_analysis: str, user_description: str = "") -> str:
         """
+        Generate an optimized eBay title
         
+        Args:
+            product_analysis: Analysis of the product from images
+            user_description: Additional user description
+            
+        Returns:
+            Generated eBay title (max 80 characters)
+        """
+        return self._run(self._atitle(product_analysis, user_description))
+    
+    @on_generator_loop
+    async def _atitle(self, product_analysis: str, user_description: str = "") -> str:
+        """
+        Async implementation of generate_ebay_title
+        """
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert eBay listing title generator."},
-                    {"role": "user", "content": prompt}
-                ],
+            response = await self._acreate(
+                model=self.fast_model,
+                messages=self._listing_messages(product_analysis, user_description, TITLE_INSTRUCTION, 100),
                 max_tokens=100,
                 temperature=0.7
             )
@@ -165,42 +725,123 @@ class eBayListingGenerator:
         Returns:
             Generated eBay description in HTML format
         """
-        prompt = f"""
-        Create a comprehensive eBay product description based on the analysis and user input.
+        return self._run(self._adesc(product_analysis, user_description))
+    
+    @on_generator_loop
+    async def _adesc(self, product_analysis: str, user_description: str = "") -> str:
+        """
+        Async implementation of generate_ebay_description
+        """
+        try:
+            chunks = [chunk async for chunk in self._adescription_stream(product_analysis, user_description)]
+            return "".join(chunks).strip()
+            
+        except Exception as e:
+            return f"<p>Error generating description: {str(e)}</p>"
+    
+    def generate_description_stream(self, product_analysis: str, user_description: str = "") -> Iterator[str]:
+        """
+        Stream a comprehensive eBay description as it is generated
         
-        Product Analysis: {product_analysis}
-        User Description: {user_description}
+        This is the entry point for UI code: it is a plain generator, e.g. for
+        st.write_stream, fed by the request running on the generator's loop.
         
-        Structure the description with:
-        1. Product overview and key features
-        2. Detailed specifications
-        3. Condition details
-        4. Shipping and return information
-        5. Professional closing
+        Args:
+            product_analysis: Analysis of the product from images
+            user_description: Additional user description
+            
+        Yields:
+            Chunks of the eBay description in HTML format
+        """
+        chunks = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(
+            self._apump_description(product_analysis, user_description, chunks.put), self._loop
+        )
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is _STREAM_END:
+                    return
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+        finally:
+            # Stops the request if the consumer gives up early
+            future.cancel()
+    
+    async def agenerate_description_stream(self, product_analysis: str, user_description: str = "") -> AsyncIterator[str]:
+        """
+        Async version of generate_description_stream
         
-        Use HTML formatting for better presentation. Include:
-        - Bullet points for features
-        - Bold text for important information
-        - Clear sections and headers
+        Can be consumed from any event loop; the request itself always runs on
+        the generator's loop.
         
-        Make it professional and informative to increase buyer confidence.
+        Args:
+            product_analysis: Analysis of the product from images
+            user_description: Additional user description
+            
+        Yields:
+            Chunks of the eBay description in HTML format
         """
+        if asyncio.get_running_loop() is self._loop:
+            async for chunk in self._adescription_stream(product_analysis, user_description):
+                yield chunk
+            return
         
+        caller_loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue()
+        future = asyncio.run_coroutine_threadsafe(
+            self._apump_description(
+                product_analysis,
+                user_description,
+                lambda chunk: caller_loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+            ),
+            self._loop
+        )
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert eBay listing description writer."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2000,
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content.strip()
-            
+            while True:
+                chunk = await chunks.get()
+                if chunk is _STREAM_END:
+                    return
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+        finally:
+            future.cancel()
+    
+    async def _apump_description(self, product_analysis: str, user_description: str, put: Callable):
+        """
+        Feed description chunks to a consumer on another thread or loop
+        
+        Args:
+            product_analysis: Analysis of the product from images
+            user_description: Additional user description
+            put: Thread-safe callback receiving each chunk, then an exception
+                if the request failed, then _STREAM_END
+        """
+        try:
+            async for chunk in self._adescription_stream(product_analysis, user_description):
+                put(chunk)
         except Exception as e:
-            return f"<p>Error generating description: {str(e)}</p>"
+            put(e)
+        finally:
+            put(_STREAM_END)
+    
+    async def _adescription_stream(self, product_analysis: str, user_description: str = "") -> AsyncIterator[str]:
+        """
+        Async implementation of generate_description_stream, run on the generator's loop
+        """
+        stream = await self._acreate(
+            model=self.writer_model,
+            messages=self._listing_messages(product_analysis, user_description, DESCRIPTION_INSTRUCTION, 2000),
+            max_tokens=2000,
+            temperature=0.7,
+            stream=True
+        )
+        
+        async for chunk in stream:
+            if chunk.choices:
+                yield chunk.choices[0].delta.content or ""
     
     def categorize_product(self, product_analysis: str, user_description: str = "") -> str:
         """
@@ -213,31 +854,17 @@ class eBayListingGenerator:
         Returns:
             eBay category suggestion
         """
-        prompt = f"""
-        Based on the product analysis, suggest the most appropriate eBay category.
-        
-        Product Analysis: {product_analysis}
-        User Description: {user_description}
-        
-        Provide the category in this format: "Main Category > Subcategory > Specific Category"
-        
-        Common eBay categories include:
-        - Electronics > Computers & Tablets > Laptops & Netbooks
-        - Fashion > Women's Clothing > Tops & Blouses
-        - Home & Garden > Kitchen, Dining & Bar > Small Kitchen Appliances
-        - Collectibles > Trading Cards > Sports Trading Cards
-        - Books > Fiction & Literature > Contemporary Fiction
-        
-        Choose the most specific and accurate category possible.
+        return self._run(self._acat(product_analysis, user_description))
+    
+    @on_generator_loop
+    async def _acat(self, product_analysis: str, user_description: str = "") -> str:
+        """
+        Async implementation of categorize_product
         """
-        
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert eBay category classifier."},
-                    {"role": "user", "content": prompt}
-                ],
+            response = await self._acreate(
+                model=self.fast_model,
+                messages=self._listing_messages(product_analysis, user_description, CATEGORY_INSTRUCTION, 100),
                 max_tokens=100,
                 temperature=0.5
             )
@@ -258,77 +885,437 @@ class eBayListingGenerator:
         Returns:
             Estimated weight in kg
         """
-        prompt = f"""
-        Based on the product analysis, estimate the postage weight in kilograms.
-        
-        Product Analysis: {product_analysis}
-        User Description: {user_description}
-        
-        Consider:
-        - Product size and materials
-        - Typical weight for similar items
-        - Packaging requirements
-        - Add 10-15% for packaging materials
-        
-        Provide only the numeric weight value in kg (e.g., 0.5 for 500g, 2.0 for 2kg).
-        Be conservative and slightly overestimate for accurate shipping costs.
+        return self._run(self._aweight(product_analysis, user_description))
+    
+    @on_generator_loop
+    async def _aweight(self, product_analysis: str, user_description: str = "") -> float:
+        """
+        Async implementation of estimate_postage_weight
         """
-        
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert shipping weight estimator."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=50,
-                temperature=0.3
+            # A deterministic, tightly bounded decode: the answer is a single number
+            response = await self._acreate(
+                model=self.fast_model,
+                messages=self._listing_messages(product_analysis, user_description, WEIGHT_INSTRUCTION, 16),
+                response_format={"type": "json_object"},
+                max_tokens=16,
+                temperature=0
             )
             
             weight_str = response.choices[0].message.content.strip()
-            
-            # Extract numeric value from response
             try:
-                weight = float(weight_str)
-                return max(0.1, weight)  # Minimum 100g for postage
-            except ValueError:
-                # If conversion fails, return a default weight
-                return 0.5
+                return self._parse_weight(json.loads(weight_str).get("kg"))
+            except (ValueError, AttributeError):
+                return self._parse_weight(weight_str)
                 
         except Exception as e:
             return 0.5  # Default weight if estimation fails
     
+    def _parse_weight(self, value) -> float:
+        """
+        Convert a model-provided weight to kilograms
+        
+        Args:
+            value: Number or string such as "1.2" or "1.2 kg"
+            
+        Returns:
+            Weight in kg, at least 0.1, or 0.5 if no number could be found
+        """
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            weight = float(value)
+        else:
+            match = _WEIGHT_RE.search(str(value))
+            if not match:
+                # If no number is present, return a default weight
+                return 0.5
+            weight = float(match.group())
+        
+        return max(0.1, weight)  # Minimum 100g for postage
+    
+    def generate_listing_fields(self, product_analysis: str, user_description: str = "") -> Dict:
+        """
+        Generate the title, description, category and weight in one request
+        
+        Args:
+            product_analysis: Analysis of the product from images
+            user_description: Additional user description
+            
+        Returns:
+            Dictionary with "title", "description", "category" and "weight" keys
+        """
+        return self._run(self._afields(product_analysis, user_description))
+    
+    @on_generator_loop
+    async def _afields(self, product_analysis: str, user_description: str = "") -> Dict:
+        """
+        Async implementation of generate_listing_fields
+        """
+        response = await self._acreate(
+            model=self.writer_model,
+            messages=self._listing_messages(
+                product_analysis, user_description, LISTING_FIELDS_INSTRUCTION, LISTING_FIELDS_MAX_TOKENS
+            ),
+            response_format={"type": "json_object"},
+            max_tokens=LISTING_FIELDS_MAX_TOKENS,
+            temperature=0.7
+        )
+        
+        choice = response.choices[0]
+        if choice.finish_reason == "length":
+            raise ValueError(f"Listing generation was cut off at {LISTING_FIELDS_MAX_TOKENS} tokens before the JSON was complete")
+        
+        return self._parse_listing_fields(choice.message.content)
+    
+    def _parse_listing_fields(self, content: str) -> Dict:
+        """
+        Parse and normalise the JSON returned for a combined listing request
+        
+        Args:
+            content: JSON message content returned by the model
+            
+        Returns:
+            Dictionary with "title", "description", "category" and "weight" keys
+        """
+        fields = json.loads(content)
+        
+        # Ensure title is within eBay's 80 character limit
+        title = str(fields.get("title") or "").strip()[:80]
+        
+        weight = self._parse_weight(fields.get("weight"))
+        
+        return {
+            "title": title,
+            "description": str(fields.get("description") or "").strip(),
+            "category": str(fields.get("category") or "").strip(),
+            "weight": weight
+        }
+    
     def generate_complete_listing(self, image_paths: List[str], user_description: str = "") -> ProductListing:
         """
         Generate a complete eBay listing with all details
         
         Args:
-            image_paths: List of paths to product images
+            image_paths: List of paths, http(s) URLs or raw bytes of product images
             user_description: Optional user-provided description
             
         Returns:
             ProductListing object with all generated details
         """
-        # Step 1: Analyze product images
-        analysis_result = self.analyze_product_images(image_paths, user_description)
+        return self._run(self.agenerate_complete_listing(image_paths, user_description))
+    
+    def generate_complete_listing_from_bytes(self, image_bytes: List[bytes], user_description: str = "") -> ProductListing:
+        """
+        Generate a complete eBay listing from in-memory images
         
-        if not analysis_result["success"]:
-            raise Exception(f"Failed to analyze images: {analysis_result['error']}")
+        Avoids writing uploaded files to disk just so they can be read back.
         
-        product_analysis = analysis_result["analysis"]
+        Args:
+            image_bytes: List of raw image file contents
+            user_description: Optional user-provided description
+            
+        Returns:
+            ProductListing object with all generated details
+        """
+        return self.generate_complete_listing(image_bytes, user_description)
+    
+    @on_generator_loop
+    async def agenerate_complete_listing(self, image_paths: List[str], user_description: str = "") -> ProductListing:
+        """
+        Generate a complete eBay listing with all details
         
-        # Step 2: Generate all listing components
-        title = self.generate_ebay_title(product_analysis, user_description)
-        description = self.generate_ebay_description(product_analysis, user_description)
-        category = self.categorize_product(product_analysis, user_description)
-        weight = self.estimate_postage_weight(product_analysis, user_description)
+        Args:
+            image_paths: List of paths, http(s) URLs or raw bytes of product images
+            user_description: Optional user-provided description
+            
+        Returns:
+            ProductListing object with all generated details
+        """
+        # Identical images and description: reuse the previous listing outright.
+        # The key covers exactly the images the analysis will see
+        unique_images = (await asyncio.to_thread(self._dedupe_images, image_paths))[:6]  # Limit to 6 images
+        cache_key = self._listing_cache_key(unique_images, user_description)
+        fields = self._cache.get(cache_key)
+        
+        if fields is None:
+            # Step 1: Analyze product images
+            analysis_result = await self._aanalyze_unique(unique_images)
+            
+            if not analysis_result["success"]:
+                raise Exception(f"Failed to analyze images: {analysis_result['error']}")
+            
+            product_analysis = analysis_result["analysis"]
+            
+            # Step 2: Reuse the fields of a near-identical product with the same
+            # description, or generate all listing components in a single call
+            fields = await self._asemantic_fields(product_analysis, user_description)
+            
+            self._cache[cache_key] = fields
         
         return ProductListing(
-            title=title,
-            description=description,
-            category=category,
-            postage_weight=weight
+            title=fields["title"],
+            description=fields["description"],
+            category=fields["category"],
+            postage_weight=fields["weight"]
+        )
+    
+    def generate_listings(self, products: List[Tuple[List[str], str]], concurrency: int = 8) -> List:
+        """
+        Generate complete listings for many products concurrently
+        
+        Args:
+            products: List of (image_paths, user_description) tuples
+            concurrency: Maximum number of products processed at once
+            
+        Returns:
+            List in the same order as products, holding a ProductListing or
+            the exception raised for that product
+        """
+        return self._run(self.agenerate_listings(products, concurrency))
+    
+    @on_generator_loop
+    async def agenerate_listings(self, products: List[Tuple[List[str], str]], concurrency: int = 8) -> List:
+        """
+        Async implementation of generate_listings
+        
+        Can be awaited from any event loop; the work always runs on the generator's loop.
+        """
+        sem = asyncio.Semaphore(concurrency)
+        
+        async def generate_one(image_paths: List[str], user_description: str) -> ProductListing:
+            async with sem:
+                return await self.agenerate_complete_listing(image_paths, user_description)
+        
+        return await asyncio.gather(
+            *(generate_one(image_paths, user_description) for image_paths, user_description in products),
+            return_exceptions=True
+        )
+    
+    def _listing_cache_key(self, unique_images: List[Tuple[str, bytes]], user_description: str) -> str:
+        """
+        Build the exact cache key for a listing request
+        
+        Args:
+            unique_images: (path, content digest) of the images sent for analysis
+            user_description: User-provided description
+            
+        Returns:
+            SHA-256 hex digest of the image digests and description
+        """
+        digest = hashlib.sha256(b"".join(sorted(image_digest for _, image_digest in unique_images)))
+        digest.update(user_description.encode("utf-8"))
+        return f"listing:{digest.hexdigest()}"
+    
+    @on_generator_loop
+    async def _asemantic_fields(self, product_analysis: str, user_description: str) -> Dict:
+        """
+        Get listing fields from the semantic cache, or generate and cache them
+        
+        The semantic cache is optional: a failed embedding is treated as a miss.
+        It is only consulted when an entry with the same description exists;
+        otherwise the embedding for storing the result runs alongside generation.
+        
+        Args:
+            product_analysis: Analysis of the product from images
+            user_description: User-provided description
+            
+        Returns:
+            Dictionary with "title", "description", "category" and "weight" keys
+        """
+        if self._has_semantic_candidates(user_description):
+            try:
+                embedding = await self._aembed(product_analysis)
+            except Exception:
+                embedding = None
+            fields = None if embedding is None else self._semantic_lookup(embedding, user_description)
+            if fields is not None:
+                return fields
+            fields = await self._afields(product_analysis, user_description)
+        else:
+            fields, embedding = await asyncio.gather(
+                self._afields(product_analysis, user_description),
+                self._aembed(product_analysis),
+                return_exceptions=True
+            )
+            if isinstance(fields, BaseException):
+                raise fields
+            if isinstance(embedding, BaseException):
+                embedding = None
+        
+        if embedding is not None:
+            self._semantic_store(embedding, user_description, fields)
+        return fields
+    
+    @on_generator_loop
+    @retry_transient
+    async def _aembed(self, text: str) -> np.ndarray:
+        """
+        Embed text for the semantic cache
+        
+        Args:
+            text: Text to embed
+            
+        Returns:
+            Unit-length embedding vector
+        """
+        async with self._sem:
+            response = await self._client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+        vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+    
+    def _has_semantic_candidates(self, user_description: str) -> bool:
+        """
+        Check whether any semantic cache entry was generated for this description
+        
+        Args:
+            user_description: User-provided description
+            
+        Returns:
+            True if a semantic cache hit is possible
+        """
+        return any(description == user_description for description, _ in self._semantic_entries)
+    
+    def _semantic_lookup(self, embedding: np.ndarray, user_description: str) -> Optional[Dict]:
+        """
+        Find cached listing fields for a semantically equivalent product
+        
+        Only entries generated for exactly the same user description can match,
+        so edits to the description are never answered with stale fields.
+        
+        Args:
+            embedding: Unit-length embedding of the product analysis
+            user_description: User-provided description
+            
+        Returns:
+            Cached fields if the closest entry is above SEMANTIC_CACHE_THRESHOLD, else None
+        """
+        candidates = [i for i, (description, _) in enumerate(self._semantic_entries) if description == user_description]
+        if not candidates:
+            return None
+        
+        similarities = self._semantic_matrix[candidates] @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] > SEMANTIC_CACHE_THRESHOLD:
+            return self._semantic_entries[candidates[best]][1]
+        return None
+    
+    def _semantic_store(self, embedding: np.ndarray, user_description: str, fields: Dict):
+        """
+        Add generated fields to the semantic cache, evicting the oldest entry when full
+        
+        Args:
+            embedding: Unit-length embedding of the product analysis
+            user_description: User-provided description
+            fields: Listing fields generated for the product
+        """
+        if self._semantic_matrix is None:
+            self._semantic_matrix = embedding[np.newaxis, :]
+        else:
+            self._semantic_matrix = np.vstack([self._semantic_matrix[-(SEMANTIC_CACHE_SIZE - 1):], embedding])
+        self._semantic_entries = self._semantic_entries[-(SEMANTIC_CACHE_SIZE - 1):] + [(user_description, fields)]
+    
+    def submit_batch(self, listings: List[Tuple[List[str], str]]) -> str:
+        """
+        Submit many listings to the OpenAI Batch API for offline generation
+        
+        Batch requests cost half as much as live requests and use a separate
+        rate limit pool, at the price of up to 24 hours turnaround. Each product
+        is sent as a single vision request that returns the listing fields
+        directly, using the same rules as generate_listing_fields.
+        
+        Args:
+            listings: List of (image_paths, user_description) tuples
+            
+        Returns:
+            ID of the created batch. Results are keyed "listing-<index>" by
+            position in listings.
+        """
+        lines = []
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            for i, (image_paths, user_description) in enumerate(listings):
+                unique_images = self._dedupe_images(image_paths)[:6]  # Limit to 6 images
+                image_contents = list(executor.map(lambda image: self._image_content(*image), unique_images))
+                prompt = BATCH_LISTING_PROMPT.format(user_description=user_description) + LISTING_FIELDS_RULES
+                request = {
+                    "custom_id": f"listing-{i}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.vision_model,
+                        "messages": [
+                            {"role": "system", "content": LISTING_FIELDS_SYSTEM},
+                            {
+                                "role": "user",
+                                "content": [{"type": "text", "text": prompt}]
+                                + image_contents
+                            }
+                        ],
+                        "response_format": {"type": "json_object"},
+                        "max_tokens": LISTING_FIELDS_MAX_TOKENS,
+                        "temperature": 0.7
+                    }
+                }
+                lines.append(json.dumps(request))
+        
+        batch_file = self.client.files.create(
+            file=("listings.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
         )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+    
+    def poll_batch(self, batch_id: str, initial_delay: float = 5.0, max_delay: float = 300.0) -> Dict[str, ProductListing]:
+        """
+        Wait for a batch to finish and collect the generated listings
+        
+        Args:
+            batch_id: ID returned by submit_batch
+            initial_delay: Seconds to wait before the second status check
+            max_delay: Upper bound for the exponential backoff between checks
+            
+        Returns:
+            Dictionary mapping custom_id to ProductListing. Requests that failed
+            are left out and can be inspected through the batch's error file.
+        """
+        delay = initial_delay
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status == "completed":
+                break
+            if batch.status in ("failed", "expired", "cancelling", "cancelled"):
+                raise Exception(f"Batch {batch_id} did not complete: {batch.status}")
+            time.sleep(delay)
+            delay = min(delay * 2, max_delay)
+        
+        listings = {}
+        if not batch.output_file_id:
+            return listings
+        
+        output = self.client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            response = result.get("response")
+            if result.get("error") or not response or response.get("status_code") != 200:
+                continue
+            
+            try:
+                fields = self._parse_listing_fields(response["body"]["choices"][0]["message"]["content"])
+            except (KeyError, IndexError, ValueError):
+                continue
+            
+            listings[result["custom_id"]] = ProductListing(
+                title=fields["title"],
+                description=fields["description"],
+                category=fields["category"],
+                postage_weight=fields["weight"]
+            )
+        
+        return listings
 
 # Example usage and testing functions
 def test_listing_generator():
@@ -1,19 +1,62 @@
 import streamlit as st
 import os
-import json
-import tempfile
+import dataclasses
+import orjson
 from typing import List, Dict, Optional
-import boto3
-from botocore.exceptions import ClientError
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from PIL import Image
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from PIL import Image, ImageOps
 import io
 import base64
-from datetime import datetime, timedelta
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
 
 # Import our AI module
 from ai import eBayListingGenerator, ProductListing
 
+# Images are resized to eBay's largest useful size before upload
+MAX_UPLOAD_EDGE = 1600
+UPLOAD_JPEG_QUALITY = 85
+# Filenames are unique, so eBay and CDNs may cache uploaded images indefinitely
+UPLOAD_CACHE_CONTROL = 'public, max-age=31536000'
+
+# Session state that survives "Create Another Listing"
+SESSION_KEYS_KEPT_ON_RESET = ('pending_listings', 'ebay_tokens')
+
+# Environment variables the app needs, with descriptions for the setup help
+REQUIRED_ENV_VARS = {
+    'OPENAI_API_KEY': 'OpenAI API key for AI generation',
+    'EBAY_CLIENT_ID': 'eBay API client ID',
+    'EBAY_CLIENT_SECRET': 'eBay API client secret',
+    'EBAY_REDIRECT_URI': 'eBay OAuth redirect URI',
+    'AWS_ACCESS_KEY_ID': 'AWS access key for S3 storage',
+    'AWS_SECRET_ACCESS_KEY': 'AWS secret key for S3 storage',
+    'S3_BUCKET_NAME': 'S3 bucket name for image storage'
+}
+
+# Static styles for the listing preview, emitted once per page
+PREVIEW_CSS = """
+<style>
+.ebay-preview { border: 1px solid #ddd; padding: 20px; border-radius: 8px; background: white; }
+.ebay-preview h3 { color: #0053A1; margin-top: 0; }
+.ebay-preview-row { margin: 10px 0; font-size: 14px; }
+.ebay-preview-category { background: #E5F3FF; padding: 2px 8px; border-radius: 3px; font-size: 12px; }
+.ebay-preview-body { margin-top: 15px; }
+</style>
+"""
+
+# Maximum number of items per eBay bulk Inventory API call
+EBAY_BULK_LIMIT = 25
+
+EBAY_SELL_SCOPE = "https://api.ebay.com/oauth/api_scope/sell.inventory"
+
+# Refresh access tokens this many seconds before eBay expires them
+TOKEN_EXPIRY_MARGIN = 60
+
 class CloudStorageManager:
     """
     Manages cloud storage operations for product images
@@ -21,15 +64,32 @@ class CloudStorageManager:
     
     def __init__(self, storage_type: str = "s3"):
         self.storage_type = storage_type
+        # Content digest -> URL of every image uploaded by this process
+        self._uploaded: Dict[str, str] = {}
         
         if storage_type == "s3":
+            # boto3 is slow to import, so only load it once storage is actually used
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+            from botocore.config import Config
+            
             self.s3_client = boto3.client(
                 's3',
                 aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
                 aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-                region_name=os.getenv('AWS_REGION', 'us-east-1')
+                region_name=os.getenv('AWS_REGION', 'us-east-1'),
+                # Room for the parallel uploads in upload_multiple_images
+                config=Config(max_pool_connections=16)
             )
             self.bucket_name = os.getenv('S3_BUCKET_NAME')
+            # Resized images stay well below the threshold and go up in a single PUT;
+            # anything larger is split into parts uploaded in parallel
+            self._transfer_cfg = TransferConfig(
+                multipart_threshold=8 * 1024 * 1024,
+                multipart_chunksize=8 * 1024 * 1024,
+                max_concurrency=4,
+                use_threads=True
+            )
     
     def upload_image(self, image_file, filename: str) -> str:
         """
@@ -43,43 +103,105 @@ class CloudStorageManager:
             URL of the uploaded image
         """
         try:
-            if self.storage_type == "s3":
-                self.s3_client.upload_fileobj(
-                    image_file, 
-                    self.bucket_name, 
-                    filename,
-                    ExtraArgs={'ContentType': 'image/jpeg', 'ACL': 'public-read'}
-                )
-                return f"https://{self.bucket_name}.s3.amazonaws.com/{filename}"
+            return self._put_image(image_file, filename)
             
         except Exception as e:
             st.error(f"Error uploading image: {str(e)}")
             return None
     
-    def upload_multiple_images(self, image_files: List) -> List[str]:
+    def _put_image(self, image_file, filename: str) -> str:
+        """
+        Upload image to cloud storage, raising on failure
+        
+        Safe to call from worker threads, as it does not touch the Streamlit UI.
+        The image is downscaled to MAX_UPLOAD_EDGE and re-encoded as a
+        progressive JPEG first, which is typically a fraction of the original size.
+        
+        Args:
+            image_file: File object or bytes
+            filename: Name for the file in storage
+            
+        Returns:
+            URL of the uploaded image
+        """
+        # Give each call its own file object, so concurrent uploads never share a read position
+        if isinstance(image_file, bytes):
+            image_file = io.BytesIO(image_file)
+        
+        with Image.open(image_file) as image:
+            # Apply EXIF rotation, which is lost when the image is re-encoded
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((MAX_UPLOAD_EDGE, MAX_UPLOAD_EDGE), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            image.convert('RGB').save(buffer, 'JPEG', quality=UPLOAD_JPEG_QUALITY, optimize=True, progressive=True)
+        buffer.seek(0)
+        
+        if self.storage_type == "s3":
+            self.s3_client.upload_fileobj(
+                buffer, 
+                self.bucket_name, 
+                filename,
+                ExtraArgs={
+                    'ContentType': 'image/jpeg',
+                    'CacheControl': UPLOAD_CACHE_CONTROL,
+                    'ACL': 'public-read'
+                },
+                Config=self._transfer_cfg
+            )
+            return self.public_url(filename)
+    
+    def public_url(self, filename: str) -> str:
+        """
+        Get the public URL of an object in cloud storage
+        
+        Args:
+            filename: Name of the file in storage
+            
+        Returns:
+            URL of the stored image
+        """
+        return f"https://{self.bucket_name}.s3.amazonaws.com/{filename}"
+    
+    def upload_multiple_images(self, image_files: List[bytes]) -> List[str]:
         """
         Upload multiple images to cloud storage
         
         Args:
-            image_files: List of image file objects
+            image_files: List of raw image bytes
             
         Returns:
             List of URLs of uploaded images
         """
-        urls = []
-        for i, image_file in enumerate(image_files):
+        # Random names never collide; the date prefix partitions the bucket
+        prefix = datetime.now(timezone.utc).strftime("%Y/%m/%d")
+        digests = []
+        uploads = {}
+        for image_file in image_files:
             if image_file is not None:
-                # Generate unique filename
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"product_images/{timestamp}_{i}.jpg"
-                
-                # Reset file pointer
-                image_file.seek(0)
-                
-                url = self.upload_image(image_file, filename)
-                if url:
-                    urls.append(url)
+                # Images already uploaded by this process, or repeated in this batch, are sent once
+                digest = hashlib.blake2b(image_file, digest_size=16).hexdigest()
+                digests.append(digest)
+                if digest not in self._uploaded and digest not in uploads:
+                    uploads[digest] = (image_file, f"product_images/{prefix}/{uuid.uuid4().hex}.jpg")
         
+        # Upload concurrently; the boto3 client is thread-safe and shares its connection pool
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            futures = {
+                digest: executor.submit(self._put_image, image_file, filename)
+                for digest, (image_file, filename) in uploads.items()
+            }
+        
+        # Report errors from the script thread, where Streamlit calls are allowed
+        for digest, future in futures.items():
+            try:
+                url = future.result()
+            except Exception as e:
+                st.error(f"Error uploading image: {str(e)}")
+                continue
+            if url:
+                self._uploaded[digest] = url
+        
+        urls = [self._uploaded[digest] for digest in digests if digest in self._uploaded]
         return urls
 
 class eBayAPIManager:
@@ -91,14 +213,62 @@ class eBayAPIManager:
         self.client_id = os.getenv('EBAY_CLIENT_ID')
         self.client_secret = os.getenv('EBAY_CLIENT_SECRET')
         self.redirect_uri = os.getenv('EBAY_REDIRECT_URI')
-        self.access_token = None
-        self.refresh_token = None
+        
+        # Credentials are fixed for the process, so encode the Basic auth value once
+        self._basic_auth = base64.b64encode(f"{self.client_id}:{self.client_secret}".encode()).decode()
         
         # eBay API endpoints
         self.sandbox_base_url = "https://api.sandbox.ebay.com"
         self.production_base_url = "https://api.ebay.com"
         self.is_sandbox = os.getenv('EBAY_SANDBOX', 'true').lower() == 'true'
         self.base_url = self.sandbox_base_url if self.is_sandbox else self.production_base_url
+        
+        # Persistent session so the token and listing calls reuse one TLS connection.
+        # Failed responses are returned rather than raised, so eBay's error body is kept
+        self.session = requests.Session()
+        retries = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # POSTs are only retried where repeating them is safe: token requests and
+        # the bulk endpoint, which creates or replaces by SKU. Single draft creates
+        # are not, as a retry after a lost response would duplicate the draft
+        post_adapter = HTTPAdapter(max_retries=retries.new(allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {'POST'}))
+        for path in ("/identity/v1/oauth2/token", "/sell/inventory/v1/bulk_create_or_replace_inventory_item"):
+            self.session.mount(f"{self.base_url}{path}", post_adapter)
+        self.session.headers.update({'Accept': 'application/json'})
+    
+    @property
+    def _tokens(self) -> Dict:
+        """
+        Get the OAuth tokens of the current user
+        
+        The manager is shared between sessions, so tokens live in session state
+        and survive reruns without repeating the OAuth flow.
+        """
+        if 'ebay_tokens' not in st.session_state:
+            st.session_state.ebay_tokens = {}
+        return st.session_state.ebay_tokens
+    
+    @property
+    def access_token(self) -> Optional[str]:
+        """
+        Get the current user's eBay access token, if any
+        """
+        return self._tokens.get('access_token')
+    
+    @property
+    def refresh_token(self) -> Optional[str]:
+        """
+        Get the current user's eBay refresh token, if any
+        """
+        return self._tokens.get('refresh_token')
     
     def get_oauth_url(self) -> str:
         """
@@ -107,8 +277,7 @@ class eBayAPIManager:
         Returns:
             OAuth URL for user authorization
         """
-        scope = "https://api.ebay.com/oauth/api_scope/sell.inventory"
-        oauth_url = f"https://auth.ebay.com/oauth2/authorize?client_id={self.client_id}&response_type=code&redirect_uri={self.redirect_uri}&scope={scope}"
+        oauth_url = f"https://auth.ebay.com/oauth2/authorize?client_id={self.client_id}&response_type=code&redirect_uri={self.redirect_uri}&scope={EBAY_SELL_SCOPE}"
         return oauth_url
     
     def get_access_token(self, authorization_code: str) -> bool:
@@ -121,13 +290,6 @@ class eBayAPIManager:
         Returns:
             True if successful, False otherwise
         """
-        token_url = f"{self.base_url}/identity/v1/oauth2/token"
-        
-        headers = {
-            'Content-Type': 'application/x-www-form-urlencoded',
-            'Authorization': f'Basic {base64.b64encode(f"{self.client_id}:{self.client_secret}".encode()).decode()}'
-        }
-        
         data = {
             'grant_type': 'authorization_code',
             'code': authorization_code,
@@ -135,19 +297,73 @@ class eBayAPIManager:
         }
         
         try:
-            response = requests.post(token_url, headers=headers, data=data)
-            response.raise_for_status()
-            
-            token_data = response.json()
-            self.access_token = token_data.get('access_token')
-            self.refresh_token = token_data.get('refresh_token')
-            
+            self._request_token(data)
             return True
             
-        except requests.RequestException as e:
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
             st.error(f"Error getting access token: {str(e)}")
             return False
     
+    def refresh_access_token(self) -> bool:
+        """
+        Get a new access token using the stored refresh token
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.refresh_token:
+            return False
+        
+        data = {
+            'grant_type': 'refresh_token',
+            'refresh_token': self.refresh_token,
+            'scope': EBAY_SELL_SCOPE
+        }
+        
+        try:
+            self._request_token(data)
+            return True
+            
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
+            st.error(f"Error refreshing access token: {str(e)}")
+            return False
+    
+    def ensure_access_token(self) -> bool:
+        """
+        Make sure a valid access token is available, refreshing it if it has expired
+        
+        Returns:
+            True if an access token is available, False if the user must authorize
+        """
+        if self.access_token and time.time() < self._tokens.get('expires_at', 0):
+            return True
+        return self.refresh_access_token()
+    
+    def _request_token(self, data: Dict[str, str]):
+        """
+        Call the eBay token endpoint and store the returned tokens
+        
+        Args:
+            data: Form data for the token grant
+        """
+        token_url = f"{self.base_url}/identity/v1/oauth2/token"
+        
+        headers = {
+            'Content-Type': 'application/x-www-form-urlencoded',
+            'Authorization': f'Basic {self._basic_auth}'
+        }
+        
+        response = self.session.post(token_url, headers=headers, data=data)
+        response.raise_for_status()
+        
+        token_data = orjson.loads(response.content)
+        tokens = self._tokens
+        tokens['access_token'] = token_data.get('access_token')
+        # Refresh grants do not return a new refresh token
+        if token_data.get('refresh_token'):
+            tokens['refresh_token'] = token_data['refresh_token']
+        tokens['expires_at'] = time.time() + token_data.get('expires_in', 0) - TOKEN_EXPIRY_MARGIN
+    
     def create_draft_listing(self, listing: ProductListing, image_urls: List[str]) -> Dict:
         """
         Create a draft listing on eBay
@@ -159,17 +375,127 @@ class eBayAPIManager:
         Returns:
             Dictionary with listing creation result
         """
-        if not self.access_token:
+        if not self.ensure_access_token():
             return {"success": False, "error": "No access token available"}
         
-        headers = {
+        headers = self._api_headers()
+        listing_data = self._listing_payload(listing, image_urls)
+        
+        try:
+            url = f"{self.base_url}/sell/inventory/v1/inventory_item/draft"
+            # The headers already declare application/json; orjson encodes straight to bytes
+            response = self.session.post(url, headers=headers, data=orjson.dumps(listing_data))
+            
+            if response.status_code == 201:
+                return {
+                    "success": True,
+                    "listing_id": orjson.loads(response.content).get("sku"),
+                    "message": "Draft listing created successfully"
+                }
+            else:
+                return {
+                    "success": False,
+                    "error": f"API Error: {response.status_code} - {response.text}"
+                }
+                
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def create_draft_listings_bulk(self, listings: List[ProductListing], image_urls_per_listing: List[List[str]],
+                                   skus: Optional[List[str]] = None) -> Dict:
+        """
+        Create several inventory items on eBay with the bulk endpoint
+        
+        Items are sent EBAY_BULK_LIMIT at a time, so N listings cost
+        ceil(N / EBAY_BULK_LIMIT) requests instead of N. The endpoint creates or
+        replaces by SKU, so retrying with the same SKUs never duplicates items.
+        
+        Args:
+            listings: ProductListing objects with generated details
+            image_urls_per_listing: List of image URLs for each listing
+            skus: SKU for each listing; new random SKUs are used if None
+            
+        Returns:
+            Dictionary with the created SKUs and any per-item errors
+        """
+        if not self.ensure_access_token():
+            return {"success": False, "error": "No access token available"}
+        
+        headers = self._api_headers()
+        url = f"{self.base_url}/sell/inventory/v1/bulk_create_or_replace_inventory_item"
+        
+        if skus is None:
+            skus = [uuid.uuid4().hex for _ in listings]
+        
+        items = []
+        for listing, image_urls, sku in zip(listings, image_urls_per_listing, skus):
+            listing_data = self._listing_payload(listing, image_urls)
+            items.append({
+                "sku": sku,
+                "locale": "en_US",
+                "product": listing_data["product"],
+                "condition": listing_data["condition"]
+            })
+        
+        created = []
+        errors = []
+        # Each chunk is independent, so a failure in one never skips the rest
+        for start in range(0, len(items), EBAY_BULK_LIMIT):
+            try:
+                response = self.session.post(
+                    url,
+                    headers=headers,
+                    data=orjson.dumps({"requests": items[start:start + EBAY_BULK_LIMIT]})
+                )
+                
+                # 207 means the batch was processed with mixed per-item results
+                if response.status_code not in (200, 207):
+                    errors.append(f"API Error: {response.status_code} - {response.text}")
+                    continue
+                
+                for item in orjson.loads(response.content).get("responses", []):
+                    if item.get("statusCode") in (200, 201, 204):
+                        created.append(item.get("sku"))
+                    else:
+                        errors.append(f"{item.get('sku')}: {item.get('errors')}")
+                        
+            except Exception as e:
+                errors.append(str(e))
+        
+        return {
+            "success": not errors,
+            "listing_ids": created,
+            "error": "; ".join(errors),
+            "message": f"{len(created)} draft listing(s) created"
+        }
+    
+    def _api_headers(self) -> Dict[str, str]:
+        """
+        Get the headers for authenticated Sell API requests
+        """
+        return {
             'Authorization': f'Bearer {self.access_token}',
             'Content-Type': 'application/json',
+            # Required by the inventory item create and replace calls
+            'Content-Language': 'en-US',
             'X-EBAY-C-MARKETPLACE-ID': 'EBAY_US'
         }
+    
+    def _listing_payload(self, listing: ProductListing, image_urls: List[str]) -> Dict:
+        """
+        Build the eBay listing data for a generated listing
         
-        # Prepare listing data
-        listing_data = {
+        Args:
+            listing: ProductListing object with generated details
+            image_urls: List of URLs for product images
+            
+        Returns:
+            Listing data ready to be sent to the Inventory API
+        """
+        return {
             "product": {
                 "title": listing.title,
                 "description": listing.description,
@@ -200,28 +526,82 @@ class eBayAPIManager:
                 "vatPercentage": 0.0
             }
         }
+
+@st.cache_resource
+def _env_snapshot() -> Dict[str, Optional[str]]:
+    """
+    Read the required environment variables once per server process
+    
+    Call _env_snapshot.clear() to pick up changes to the environment.
+    """
+    return {var: os.getenv(var) for var in REQUIRED_ENV_VARS}
+
+@st.cache_resource
+def get_storage_manager() -> CloudStorageManager:
+    """
+    Get the shared CloudStorageManager, created once per server process
+    """
+    return CloudStorageManager()
+
+@st.cache_resource
+def get_ebay_manager() -> eBayAPIManager:
+    """
+    Get the shared eBayAPIManager, created once per server process
+    """
+    return eBayAPIManager()
+
+@st.cache_resource
+def get_generator() -> eBayListingGenerator:
+    """
+    Get the shared eBayListingGenerator, created once per server process
+    """
+    return eBayListingGenerator()
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _generate_cached(img_hashes: tuple, user_description: str, _images: List[bytes]) -> ProductListing:
+    """
+    Generate a listing, memoized on the image content hashes and description
+    
+    Args:
+        img_hashes: Content hashes of the images, used as the cache key
+        user_description: User-provided description
+        _images: Raw image bytes; not hashed by Streamlit
         
-        try:
-            url = f"{self.base_url}/sell/inventory/v1/inventory_item/draft"
-            response = requests.post(url, headers=headers, json=listing_data)
-            
-            if response.status_code == 201:
-                return {
-                    "success": True,
-                    "listing_id": response.json().get("sku"),
-                    "message": "Draft listing created successfully"
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"API Error: {response.status_code} - {response.text}"
-                }
-                
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e)
-            }
+    Returns:
+        ProductListing object with all generated details
+    """
+    return get_generator().generate_complete_listing_from_bytes(_images, user_description)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _thumbnail_png(file_bytes: bytes) -> bytes:
+    """
+    Render a small preview thumbnail, decoded once per distinct file
+    
+    Args:
+        file_bytes: Raw bytes of the uploaded image
+        
+    Returns:
+        PNG bytes of the thumbnail
+    """
+    with Image.open(io.BytesIO(file_bytes)) as image:
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((320, 320))
+        if image.mode not in ("RGB", "RGBA", "L"):
+            image = image.convert("RGB")
+        buffer = io.BytesIO()
+        image.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+def display_reload_env_button(key: str):
+    """
+    Display a button that re-reads the environment variables
+    
+    Args:
+        key: Unique widget key for this button
+    """
+    if st.button("🔄 Reload environment", key=key, help="Re-read environment variables after changing them"):
+        _env_snapshot.clear()
+        st.rerun()
 
 def init_session_state():
     """
@@ -235,6 +615,8 @@ def init_session_state():
         st.session_state.image_urls = []
     if 'listing_created' not in st.session_state:
         st.session_state.listing_created = False
+    if 'pending_listings' not in st.session_state:
+        st.session_state.pending_listings = []
 
 def display_image_upload():
     """
@@ -263,32 +645,38 @@ def display_image_upload():
         cols = st.columns(3)
         for i, uploaded_file in enumerate(uploaded_files):
             with cols[i % 3]:
-                image = Image.open(uploaded_file)
-                st.image(image, caption=f"Image {i+1}", use_column_width=True)
+                st.image(_thumbnail_png(uploaded_file.getvalue()), caption=f"Image {i+1}", use_column_width=True)
         
         st.session_state.uploaded_images = uploaded_files
         return True
     
     return False
 
+@st.fragment
 def display_description_input():
     """
     Display the description input interface
+    
+    Runs as a fragment, so editing the description does not rerun the rest of
+    the page. The text is read from st.session_state.user_description.
     """
     st.subheader("📝 Product Description")
     
-    user_description = st.text_area(
+    st.text_area(
         "Add any additional details about your product",
+        key="user_description",
         placeholder="e.g., Brand, model, condition, size, color, any defects, purchase date, etc.",
         height=120,
         help="Provide any additional context that might not be visible in the photos. This helps generate more accurate listings."
     )
-    
-    return user_description
 
+@st.fragment
 def display_generated_listing(listing: ProductListing):
     """
-    Display the generated listing details
+    Display the generated listing details and apply the user's edits to it
+    
+    Runs as a fragment, so editing the listing only reruns this function.
+    Fragments cannot return values; the listing is updated in place.
     """
     st.subheader("🎯 Generated eBay Listing")
     
@@ -336,21 +724,13 @@ def display_generated_listing(listing: ProductListing):
     with tab4:
         st.write("**How your listing will look:**")
         
-        # Mock eBay listing preview
+        # Mock eBay listing preview, styled by PREVIEW_CSS
         st.markdown(f"""
-        <div style="border: 1px solid #ddd; padding: 20px; border-radius: 8px; background: white;">
-            <h3 style="color: #0053A1; margin-top: 0;">{edited_title}</h3>
-            <div style="margin: 10px 0;">
-                <span style="background: #E5F3FF; padding: 2px 8px; border-radius: 3px; font-size: 12px;">
-                    {listing.category}
-                </span>
-            </div>
-            <div style="margin: 10px 0; font-size: 14px;">
-                <strong>Weight:</strong> {listing.postage_weight} kg
-            </div>
-            <div style="margin-top: 15px;">
-                {edited_description}
-            </div>
+        <div class="ebay-preview">
+            <h3>{edited_title}</h3>
+            <div class="ebay-preview-row"><span class="ebay-preview-category">{listing.category}</span></div>
+            <div class="ebay-preview-row"><strong>Weight:</strong> {override_weight} kg</div>
+            <div class="ebay-preview-body">{edited_description}</div>
         </div>
         """, unsafe_allow_html=True)
     
@@ -358,8 +738,6 @@ def display_generated_listing(listing: ProductListing):
     listing.title = edited_title
     listing.description = edited_description
     listing.postage_weight = override_weight
-    
-    return listing
 
 def main():
     """
@@ -373,6 +751,7 @@ def main():
     
     # Initialize session state
     init_session_state()
+    st.markdown(PREVIEW_CSS, unsafe_allow_html=True)
     
     # Header
     st.title("🏷️ eBay Listing Generator")
@@ -384,7 +763,8 @@ def main():
         
         # Check if required environment variables are set
         required_vars = ['OPENAI_API_KEY', 'EBAY_CLIENT_ID', 'AWS_ACCESS_KEY_ID']
-        missing_vars = [var for var in required_vars if not os.getenv(var)]
+        env = _env_snapshot()
+        missing_vars = [var for var in required_vars if not env[var]]
         
         if missing_vars:
             st.error(f"Missing environment variables: {', '.join(missing_vars)}")
@@ -392,6 +772,8 @@ def main():
         else:
             st.success("✅ All API keys configured")
         
+        display_reload_env_button("reload_env_sidebar")
+        
         # Runtime options
         st.subheader("Options")
         use_sandbox = st.checkbox("Use eBay Sandbox", value=True, help="Use eBay sandbox for testing")
@@ -415,34 +797,42 @@ def main():
         has_images = display_image_upload()
         
         # Step 2: Description Input
-        user_description = display_description_input()
+        display_description_input()
         
         # Step 3: Generate Listing
         if has_images and st.button("🚀 Generate eBay Listing", type="primary"):
             with st.spinner("Analyzing images and generating listing..."):
                 try:
-                    # Initialize the AI generator
-                    generator = eBayListingGenerator()
+                    user_description = st.session_state.get("user_description", "")
                     
-                    # Save uploaded images to temporary files
-                    temp_paths = []
-                    for i, uploaded_file in enumerate(st.session_state.uploaded_images):
-                        with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp_file:
-                            tmp_file.write(uploaded_file.getvalue())
-                            temp_paths.append(tmp_file.name)
+                    # Pass the uploaded images to the generator straight from memory,
+                    # keyed by cheap content hashes so identical inputs reuse the last result
+                    image_bytes = [uploaded_file.getvalue() for uploaded_file in st.session_state.uploaded_images]
+                    img_hashes = tuple(hashlib.blake2b(data, digest_size=16).hexdigest() for data in image_bytes)
                     
-                    # Generate the listing
-                    listing = generator.generate_complete_listing(temp_paths, user_description)
-                    st.session_state.generated_listing = listing
+                    # Generate the listing in the background. All images already go to the
+                    # vision model in a single request, so the remaining independent work,
+                    # uploading them to cloud storage, runs here at the same time
+                    image_urls = []
+                    with ThreadPoolExecutor(max_workers=1) as executor:
+                        future = executor.submit(_generate_cached, img_hashes, user_description, image_bytes)
+                        
+                        if auto_upload_images:
+                            try:
+                                image_urls = get_storage_manager().upload_multiple_images(image_bytes)
+                            except Exception as e:
+                                st.error(f"Error uploading images: {str(e)}")
+                        
+                        listing = future.result()
                     
-                    # Clean up temporary files
-                    for path in temp_paths:
-                        try:
-                            os.unlink(path)
-                        except:
-                            pass
+                    # Only replace the shown listing and its images together, so a failed
+                    # generation never pairs the previous listing with these images
+                    st.session_state.generated_listing = listing
+                    st.session_state.image_urls = image_urls
                     
                     st.success("✅ Listing generated successfully!")
+                    if st.session_state.image_urls:
+                        st.success(f"✅ {len(st.session_state.image_urls)} images uploaded successfully!")
                     
                 except Exception as e:
                     st.error(f"Error generating listing: {str(e)}")
@@ -450,21 +840,17 @@ def main():
     with col2:
         # Display generated listing if available
         if st.session_state.generated_listing:
-            final_listing = display_generated_listing(st.session_state.generated_listing)
+            display_generated_listing(st.session_state.generated_listing)
+            final_listing = st.session_state.generated_listing
             
             # Upload images to cloud storage if enabled
             if auto_upload_images and st.button("☁️ Upload Images to Cloud"):
                 with st.spinner("Uploading images to cloud storage..."):
                     try:
-                        storage_manager = CloudStorageManager()
-                        
-                        # Convert uploaded files to file objects
-                        image_files = []
-                        for uploaded_file in st.session_state.uploaded_images:
-                            uploaded_file.seek(0)
-                            image_files.append(uploaded_file)
+                        storage_manager = get_storage_manager()
                         
-                        image_urls = storage_manager.upload_multiple_images(image_files)
+                        image_bytes = [uploaded_file.getvalue() for uploaded_file in st.session_state.uploaded_images]
+                        image_urls = storage_manager.upload_multiple_images(image_bytes)
                         st.session_state.image_urls = image_urls
                         
                         st.success(f"✅ {len(image_urls)} images uploaded successfully!")
@@ -477,67 +863,87 @@ def main():
                     except Exception as e:
                         st.error(f"Error uploading images: {str(e)}")
             
-            # Create eBay draft listing
-            if st.session_state.image_urls and st.button("📝 Create eBay Draft Listing"):
-                with st.spinner("Creating draft listing on eBay..."):
-                    try:
-                        ebay_manager = eBayAPIManager()
+            # Queue the listing so several drafts can be created in one bulk request.
+            # A copy is queued, as the editor keeps updating the shown listing in place,
+            # and the SKU is fixed now so retrying a failed create replaces, not duplicates
+            if st.session_state.image_urls and st.button("➕ Add to eBay Drafts"):
+                st.session_state.pending_listings.append({
+                    "sku": uuid.uuid4().hex,
+                    "listing": dataclasses.replace(final_listing),
+                    "image_urls": st.session_state.image_urls
+                })
+                st.success(f"✅ Added to drafts ({len(st.session_state.pending_listings)} pending)")
+        
+        # Create all pending eBay draft listings
+        pending = st.session_state.pending_listings
+        if pending and st.button(f"📝 Create {len(pending)} eBay Draft Listing(s)"):
+            with st.spinner("Creating draft listings on eBay..."):
+                try:
+                    ebay_manager = get_ebay_manager()
+                    
+                    # For demonstration, we'll show what would be sent to eBay
+                    if not ebay_manager.ensure_access_token():
+                        st.warning("eBay authentication required. This would normally redirect to eBay for authorization.")
+                        st.info("Draft listings would be created with the following details:")
                         
-                        # For demonstration, we'll show what would be sent to eBay
-                        if not ebay_manager.access_token:
-                            st.warning("eBay authentication required. This would normally redirect to eBay for authorization.")
-                            st.info("Draft listing would be created with the following details:")
-                            
-                            listing_preview = {
-                                "title": final_listing.title,
-                                "description": final_listing.description[:200] + "...",
-                                "category": final_listing.category,
-                                "weight": final_listing.postage_weight,
-                                "image_count": len(st.session_state.image_urls),
-                                "image_urls": st.session_state.image_urls
+                        listing_preview = [
+                            {
+                                "title": item["listing"].title,
+                                "description": item["listing"].description[:200] + "...",
+                                "category": item["listing"].category,
+                                "weight": item["listing"].postage_weight,
+                                "image_count": len(item["image_urls"]),
+                                "image_urls": item["image_urls"]
                             }
-                            
-                            st.json(listing_preview)
-                        else:
-                            result = ebay_manager.create_draft_listing(final_listing, st.session_state.image_urls)
-                            
-                            if result["success"]:
-                                st.success(f"✅ Draft listing created! ID: {result['listing_id']}")
-                                st.session_state.listing_created = True
-                            else:
-                                st.error(f"❌ Error creating listing: {result['error']}")
-                    
-                    except Exception as e:
-                        st.error(f"Error creating eBay listing: {str(e)}")
+                            for item in pending
+                        ]
+                        
+                        st.code(orjson.dumps(listing_preview, option=orjson.OPT_INDENT_2).decode(), language="json")
+                    else:
+                        result = ebay_manager.create_draft_listings_bulk(
+                            [item["listing"] for item in pending],
+                            [item["image_urls"] for item in pending],
+                            [item["sku"] for item in pending]
+                        )
+                        
+                        if result["listing_ids"]:
+                            st.success(f"✅ {result['message']}! IDs: {', '.join(result['listing_ids'])}")
+                            st.session_state.listing_created = True
+                        
+                        # Keep only the drafts that still need to be created
+                        created = set(result["listing_ids"])
+                        st.session_state.pending_listings = [item for item in pending if item["sku"] not in created]
+                        if not result["success"]:
+                            st.error(f"❌ Error creating listings: {result['error']}")
+                
+                except Exception as e:
+                    st.error(f"Error creating eBay listing: {str(e)}")
     
     # Footer with additional options
     if st.session_state.listing_created:
         st.success("🎉 Your eBay listing has been created as a draft! You can now visit eBay to review and publish it.")
-        
+    
+    if st.session_state.listing_created or st.session_state.pending_listings:
         if st.button("🔄 Create Another Listing"):
-            # Reset session state
+            # Reset session state, keeping the eBay tokens and the listings
+            # queued for the next bulk create
+            kept = {key: st.session_state[key] for key in SESSION_KEYS_KEPT_ON_RESET if key in st.session_state}
             for key in list(st.session_state.keys()):
                 del st.session_state[key]
-            st.experimental_rerun()
+            for key, value in kept.items():
+                st.session_state[key] = value
+            st.rerun()
 
 # Configuration check function
 def check_configuration():
     """
     Check if all required environment variables are set
     """
-    required_vars = {
-        'OPENAI_API_KEY': 'OpenAI API key for AI generation',
-        'EBAY_CLIENT_ID': 'eBay API client ID',
-        'EBAY_CLIENT_SECRET': 'eBay API client secret',
-        'EBAY_REDIRECT_URI': 'eBay OAuth redirect URI',
-        'AWS_ACCESS_KEY_ID': 'AWS access key for S3 storage',
-        'AWS_SECRET_ACCESS_KEY': 'AWS secret key for S3 storage',
-        'S3_BUCKET_NAME': 'S3 bucket name for image storage'
-    }
+    env = _env_snapshot()
     
     missing = []
-    for var, description in required_vars.items():
-        if not os.getenv(var):
+    for var, description in REQUIRED_ENV_VARS.items():
+        if not env[var]:
             missing.append(f"{var} ({description})")
     
     if missing:
@@ -559,6 +965,7 @@ def check_configuration():
         export EBAY_SANDBOX="true"  # Use false for production
         ```
         """)
+        display_reload_env_button("reload_env_setup")
         
         return False
     
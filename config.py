@@ -145,8 +145,8 @@ class ConfigurationManager:
             return False
         
         try:
-            openai.api_key = api_key
-            response = openai.ChatCompletion.create(
+            client = openai.OpenAI(api_key=api_key)
+            response = client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": "Hello"}],
                 max_tokens=5